@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""benchmark_gradebook.py - Нагрузочный тест журнала оценок nbgrader при одновременной работе нескольких grader'ов.
+
+Каждый процесс-grader открывает собственный `Gradebook` и в цикле записывает изменения (каждая запись —
+отдельный commit). Тест прогоняется дважды: с настройками SQLite по умолчанию и с профилем хранения
+из параметров командной строки (те же PRAGMA, что попадают в `<курс>_nbgrader_config.py`).
+
+Пример запуска:
+    python benchmark_gradebook.py --workers 4 --ops 200 --db-dir /tmp/gradebook-bench
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from nbgrader.api import Gradebook, InvalidEntry
+from sqlalchemy.exc import OperationalError
+
+from gradebook_pragmas import register_gradebook
+from helpers import _STORAGE_PROFILE_KEYS, _JOURNAL_MODES, _SYNCHRONOUS_MODES, _non_negative_int, _sqlite_pragmas
+
+
+def _worker(db_path: Path, pragmas: List[str], worker_id: int, ops: int, start_at: float) -> Dict:
+    """Один grader: последовательно записывает `ops` изменений в журнал оценок."""
+    register_gradebook(str(db_path), pragmas)
+    db_url = f"sqlite:///{db_path}"
+    # nbgrader пишет трассировку на каждый откат; ошибки блокировки считаются ниже
+    logging.getLogger("tornado.application").setLevel(logging.CRITICAL)
+    done = locked = 0
+
+    with Gradebook(db_url) as gb:
+        # Одновременный старт всех процессов, чтобы они конкурировали за блокировку
+        while time.time() < start_at:
+            time.sleep(0.001)
+
+        t0 = time.perf_counter()
+        for i in range(ops):
+            try:
+                gb.update_or_create_student(f"grader{worker_id}-student{i % 50}", first_name=f"v{i}")
+                done += 1
+            except (InvalidEntry, OperationalError) as e:
+                # При ошибке commit nbgrader сам откатывает сессию и оборачивает её в InvalidEntry
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+        elapsed = time.perf_counter() - t0
+
+    return dict(done=done, locked=locked, elapsed=elapsed)
+
+
+def _run(name: str, db_path: Path, pragmas: List[str], workers: int, ops: int):
+    """Прогон одного профиля и вывод результата."""
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    # Схему создаём заранее, чтобы процессы не соревновались за CREATE TABLE
+    register_gradebook(str(db_path), pragmas)
+    Gradebook(f"sqlite:///{db_path}").close()
+
+    start_at = time.time() + 1.0
+    with mp.Pool(workers) as pool:
+        results = pool.starmap(_worker, [(db_path, pragmas, w, ops, start_at) for w in range(workers)])
+
+    done = sum(r["done"] for r in results)
+    locked = sum(r["locked"] for r in results)
+    elapsed = max(r["elapsed"] for r in results)
+    print(f"{name:<10} записей: {done:>6}  ошибок блокировки: {locked:>5}  "
+          f"время: {elapsed:7.2f} с  пропускная способность: {done / elapsed:8.1f} записей/с")
+
+
+def main():
+    """Главная функция для парсинга аргументов и запуска нагрузочного теста."""
+
+    p = argparse.ArgumentParser(description="Нагрузочный тест записи в журнал оценок nbgrader")
+    p.add_argument("--workers", type=int, default=4, help="Количество одновременных grader'ов")
+    p.add_argument("--ops", type=int, default=200, help="Количество записей на одного grader'а")
+    p.add_argument("--db-dir", default=".", help="Каталог для тестовых баз данных")
+    p.add_argument("--journal-mode", default=_STORAGE_PROFILE_KEYS["journal_mode"],
+                   type=str.upper, choices=_JOURNAL_MODES,
+                   help="Режим журнала SQLite (PRAGMA journal_mode)")
+    p.add_argument("--busy-timeout", type=_non_negative_int, default=_STORAGE_PROFILE_KEYS["busy_timeout"],
+                   help="Ожидание снятия блокировки SQLite в миллисекундах")
+    p.add_argument("--synchronous", default=_STORAGE_PROFILE_KEYS["synchronous"],
+                   type=str.upper, choices=_SYNCHRONOUS_MODES,
+                   help="Режим синхронизации SQLite (PRAGMA synchronous)")
+    args = p.parse_args()
+
+    db_dir = Path(args.db_dir).resolve()
+    db_dir.mkdir(parents=True, exist_ok=True)
+
+    profile = dict(
+        journal_mode=args.journal_mode,
+        busy_timeout=args.busy_timeout,
+        synchronous=args.synchronous,
+    )
+
+    print(f"Grader'ов: {args.workers}, записей на grader'а: {args.ops}\n")
+    _run("default", db_dir / "bench_default.db", [], args.workers, args.ops)
+    _run("profile", db_dir / "bench_profile.db", _sqlite_pragmas(profile), args.workers, args.ops)
+
+
+# Точка входа
+if __name__ == "__main__":
+    main()
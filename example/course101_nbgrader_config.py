@@ -1,3 +1,19 @@
 c = get_config()
 c.CourseDirectory.root = '/home/grader-course101/course101'
 c.CourseDirectory.course_id = "course101"
+c.CourseDirectory.db_url = 'sqlite:////home/grader-course101/course101/gradebook.db'
+
+# Журнал оценок SQLite: WAL и ожидание блокировки вместо "database is locked"
+import sys
+if '/usr/local/etc/jupyter' not in sys.path:
+    sys.path.append('/usr/local/etc/jupyter')
+from gradebook_pragmas import register_gradebook
+
+register_gradebook(
+    '/home/grader-course101/course101/gradebook.db',
+    [
+        'PRAGMA busy_timeout=30000',
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+    ],
+)
@@ -0,0 +1,37 @@
+"""gradebook_pragmas.py - PRAGMA профиля хранения для журналов оценок nbgrader (SQLite).
+
+Модуль устанавливается в образ рядом с конфигурациями nbgrader. Конфигурация курса вызывает
+`register_gradebook()` при каждой своей загрузке (Formgrader перечитывает её на каждый запрос API),
+поэтому обработчик подключения SQLAlchemy регистрируется в процессе только один раз, а повторные
+вызовы лишь обновляют список PRAGMA для файла журнала.
+"""
+
+import os
+import sqlite3
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Абсолютный путь к файлу журнала -> PRAGMA, выполняемые при каждом подключении к нему
+_GRADEBOOKS: Dict[str, List[str]] = {}
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    """Выполняет PRAGMA зарегистрированного журнала оценок для нового подключения SQLite."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        db_file = cursor.execute("PRAGMA database_list").fetchone()[2]
+        for pragma in _GRADEBOOKS.get(os.path.realpath(db_file), []) if db_file else []:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def register_gradebook(db_path: str, pragmas: List[str]):
+    """Назначает PRAGMA для журнала оценок `db_path` и однократно подключает обработчик к SQLAlchemy."""
+    _GRADEBOOKS[os.path.realpath(db_path)] = list(pragmas)
+    if not event.contains(Engine, "connect", _apply_pragmas):
+        event.listen(Engine, "connect", _apply_pragmas)
@@ -118,6 +118,30 @@ create_course_structure () {
     chown -R "${USER}:${USER}" "${HOME_DIR}/${COURSE_NAME}"
 }
 
+# Preparar el directorio del gradebook y, si se pide, su mantenimiento periódico
+# Подготовить каталог журнала оценок и, при необходимости, его периодическое обслуживание
+setup_gradebook_storage () {
+    local USER="${1}"
+    local DB_PATH="${2}"
+    local INTERVAL="${3:-0}"
+    local BUSY_TIMEOUT="${4:-30000}"
+
+    if [[ -z "${DB_PATH}" ]]; then
+        return 0
+    fi
+
+    local DB_DIR="$(dirname "${DB_PATH}")"
+    mkdir -p "${DB_DIR}"
+    chown "${USER}:${USER}" "${DB_DIR}"
+
+    if [[ "${INTERVAL}" -gt 0 ]]; then
+        echo "Обслуживание журнала оценок '${DB_PATH}' каждые ${INTERVAL} с"
+        nohup sudo -u "${USER}" python3 /usr/local/bin/gradebook_maintenance.py "${DB_PATH}" \
+            --interval "${INTERVAL}" --busy-timeout "${BUSY_TIMEOUT}" \
+            >> "/tmp/gradebook-maintenance-${USER}.log" 2>&1 &
+    fi
+}
+
 get_token () {
     local jupyterhub_root="${1}"
     local user="${2}"
@@ -180,6 +204,9 @@ cp /usr/local/etc/jupyter/global_nbgrader_config.py /etc/jupyter/nbgrader_config
 # 5. Настройте nbgrader + расширения для инструкторов
 courses=(course101 course123)
 instructors=(instructor1 instructor2)
+gradebook_paths=("/home/grader-course101/course101/gradebook.db" "/home/grader-course123/course123/gradebook.db")
+gradebook_maintenance=("0" "0")
+gradebook_busy_timeouts=("30000" "30000")
 
 for index in "${!courses[@]}"; do
     course="${courses[${index}]}"
@@ -194,6 +221,8 @@ for index in "${!courses[@]}"; do
     # Setup nbgrader configuration for grading account.
     setup_nbgrader "grader-${course}" "/usr/local/etc/jupyter/${course}_nbgrader_config.py"
     create_course_structure "grader-${course}" "${course}"
+    setup_gradebook_storage "grader-${course}" "${gradebook_paths[${index}]}" \
+        "${gradebook_maintenance[${index}]}" "${gradebook_busy_timeouts[${index}]}"
 
     configure_role_extensions "grader-${course}" "grader"
 
@@ -12,6 +12,8 @@
 Вывод (директория `--output-dir`):
     jupyterhub_config.py
     setup.sh
+    gradebook_maintenance.py
+    gradebook_pragmas.py
     <курс>_nbgrader_config.py
 
 Пример запуска:
@@ -19,10 +21,11 @@
 """
 
 import datetime as _dt
+import shutil
 from pathlib import Path
 from typing import Dict, List
 
-from helpers import _bash_array
+from helpers import _bash_array, _sqlite_pragmas
 
 # ---------------------------------------------------------------------------
 # Константы
@@ -37,6 +40,10 @@ _HEADER = (
 )
 
 
+# Каталог в образе, куда устанавливается модуль gradebook_pragmas.py
+_GRADEBOOK_MODULE_DIR = "/usr/local/etc/jupyter"
+
+
 # ---------------------------------------------------------------------------
 # Генераторы файлов
 # ---------------------------------------------------------------------------
@@ -131,17 +138,38 @@ def _gen_jupyterhub_config(users: Dict, courses: Dict, out_path: Path):
     print(f"✅ jupyterhub_config -> {out_path}")
 
 
-def _gen_nbgrader_configs(courses: Dict, out_dir: Path):
+def _gen_nbgrader_configs(courses: Dict, profiles: Dict, out_dir: Path):
     """Генерация индивидуальных конфигураций nbgrader для каждого курса."""
 
     ts = _dt.datetime.now().isoformat()
     for cid in courses:
         root = f"/home/grader-{cid}/{cid}"
+        profile = profiles[cid]
         cfg = _HEADER.format(timestamp=ts) + (
             f"\nc = get_config()\n"
             f"c.CourseDirectory.root = '{root}'\n"
             f"c.CourseDirectory.course_id = '{cid}'\n"
+            f"c.CourseDirectory.db_url = {profile['db_url']!r}\n"
         )
+
+        # PRAGMA для журнала оценок SQLite: WAL и ожидание блокировки вместо "database is locked".
+        # Обработчик живёт в устанавливаемом модуле, чтобы перечитывание конфигурации не плодило его копии.
+        if profile["db_path"]:
+            pragmas = "".join(f"        {p!r},\n" for p in _sqlite_pragmas(profile))
+            cfg += (
+                "\n"
+                "import sys\n"
+                f"if {_GRADEBOOK_MODULE_DIR!r} not in sys.path:\n"
+                f"    sys.path.append({_GRADEBOOK_MODULE_DIR!r})\n"
+                "from gradebook_pragmas import register_gradebook\n"
+                "\n"
+                "register_gradebook(\n"
+                f"    {profile['db_path']!r},\n"
+                "    [\n"
+                f"{pragmas}"
+                "    ],\n"
+                ")\n"
+            )
         # Сохраняем конфигурацию курса
         (out_dir / f"{cid}_nbgrader_config.py").write_text(cfg)
         print(f"✅ {cid}_nbgrader_config -> {out_dir / f'{cid}_nbgrader_config.py'}")
@@ -180,7 +208,22 @@ def _gen_jupyter_server_config(out_path: Path):
     print(f"✅ jupyter_server_config -> {out_path}")
 
 
-def _gen_setup_script(users: Dict, courses: Dict, out_path: Path):
+def _gen_gradebook_maintenance_script(out_path: Path):
+    """Копирование скрипта периодического обслуживания журнала оценок (VACUUM/ANALYZE) в каталог вывода."""
+
+    shutil.copyfile(Path(__file__).with_name("gradebook_maintenance.py"), out_path)
+    out_path.chmod(0o755)
+    print(f"✅ gradebook_maintenance -> {out_path}")
+
+
+def _gen_gradebook_pragmas_module(out_path: Path):
+    """Копирование модуля с обработчиком PRAGMA журнала оценок, который импортируют конфигурации курсов."""
+
+    shutil.copyfile(Path(__file__).with_name("gradebook_pragmas.py"), out_path)
+    print(f"✅ gradebook_pragmas -> {out_path}")
+
+
+def _gen_setup_script(users: Dict, courses: Dict, profiles: Dict, out_path: Path):
     """Генерация Bash-скрипта setup.sh для автоматической настройки JupyterHub и пользователей."""
 
     ts = _dt.datetime.now().isoformat()
@@ -307,6 +350,29 @@ def _gen_setup_script(users: Dict, courses: Dict, out_path: Path):
         '',
         '    chown -R "${USER}:${USER}" "${HOME_DIR}/${COURSE_NAME}"',
         '}',
+        "",
+        # Функция подготовки хранилища журнала оценок и запуска его обслуживания
+        'setup_gradebook_storage () {',
+        '    local USER="${1}"',
+        '    local DB_PATH="${2}"',
+        '    local INTERVAL="${3:-0}"',
+        '    local BUSY_TIMEOUT="${4:-30000}"',
+        '',
+        '    if [[ -z "${DB_PATH}" ]]; then',
+        '        return 0',
+        '    fi',
+        '',
+        '    local DB_DIR="$(dirname "${DB_PATH}")"',
+        '    mkdir -p "${DB_DIR}"',
+        '    chown "${USER}:${USER}" "${DB_DIR}"',
+        '',
+        '    if [[ "${INTERVAL}" -gt 0 ]]; then',
+        '        echo "Обслуживание журнала оценок \'${DB_PATH}\' каждые ${INTERVAL} с"',
+        '        nohup sudo -u "${USER}" python3 /usr/local/bin/gradebook_maintenance.py "${DB_PATH}" \\',
+        '            --interval "${INTERVAL}" --busy-timeout "${BUSY_TIMEOUT}" \\',
+        '            >> "/tmp/gradebook-maintenance-${USER}.log" 2>&1 &',
+        '    fi',
+        '}',
     ]
 
     # Arrays пользователей и курсов для Bash
@@ -316,6 +382,9 @@ def _gen_setup_script(users: Dict, courses: Dict, out_path: Path):
         _bash_array('students', students),
         _bash_array('graders', graders),
         _bash_array('courses', course_ids),
+        _bash_array('gradebook_paths', [profiles[cid]["db_path"] for cid in course_ids]),
+        _bash_array('gradebook_maintenance', [str(profiles[cid]["maintenance_interval"]) for cid in course_ids]),
+        _bash_array('gradebook_busy_timeouts', [str(profiles[cid]["busy_timeout"]) for cid in course_ids]),
     ]
 
     # Основной процесс скрипта
@@ -350,6 +419,8 @@ def _gen_setup_script(users: Dict, courses: Dict, out_path: Path):
         "",
         '    setup_nbgrader "grader-${course}" "/usr/local/etc/jupyter/${course}_nbgrader_config.py"',
         '    create_course_structure "grader-${course}" "$course"',
+        '    setup_gradebook_storage "grader-${course}" "${gradebook_paths[${index}]}" \\',
+        '        "${gradebook_maintenance[${index}]}" "${gradebook_busy_timeouts[${index}]}"',
         '    configure_role_extensions "grader-${course}" "grader"',
         "done",
         "",
@@ -423,10 +494,12 @@ def _gen_dockerfile(courses: Dict, out_path: Path):
 
     L.append("COPY global_nbgrader_config.py /usr/local/etc/jupyter/global_nbgrader_config.py")
     L.append("COPY setup.sh /usr/local/bin/setup.sh")
+    L.append("COPY gradebook_maintenance.py /usr/local/bin/gradebook_maintenance.py")
+    L.append(f"COPY gradebook_pragmas.py {_GRADEBOOK_MODULE_DIR}/gradebook_pragmas.py")
     L.append("")
 
-    # Сделать скрипт setup.sh исполняемым
-    L.append("RUN chmod +x /usr/local/bin/setup.sh")
+    # Сделать скрипты исполняемыми
+    L.append("RUN chmod +x /usr/local/bin/setup.sh /usr/local/bin/gradebook_maintenance.py")
     L.append("")
 
     # Настройка рабочей директории
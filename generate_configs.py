@@ -4,12 +4,21 @@
 import argparse
 from pathlib import Path
 
-from helpers import _parse_csv
+from helpers import (
+    _parse_csv,
+    _load_storage_profiles,
+    _STORAGE_PROFILE_KEYS,
+    _JOURNAL_MODES,
+    _SYNCHRONOUS_MODES,
+    _non_negative_int,
+)
 from files_generators import (
     _gen_jupyterhub_config,
     _gen_nbgrader_configs,
     _gen_jupyter_server_config,
     _gen_global_nbgrader_config,
+    _gen_gradebook_maintenance_script,
+    _gen_gradebook_pragmas_module,
     _gen_setup_script,
     _gen_dockerfile,
 )
@@ -25,6 +34,23 @@ def main():
     p = argparse.ArgumentParser(description="Генерация конфигураций JupyterHub + nbgrader на основе CSV-файла")
     p.add_argument("csv", help="Путь к файлу users.csv")
     p.add_argument("--output-dir", default=".", help="Каталог для сохранения результатов")
+
+    # Профиль хранения журнала оценок (gradebook) по умолчанию для всех курсов
+    g = p.add_argument_group("журнал оценок")
+    g.add_argument("--gradebook-dir", default=_STORAGE_PROFILE_KEYS["gradebook_dir"],
+                   help="Каталог на быстром локальном диске для <курс>/gradebook.db (по умолчанию — корень курса)")
+    g.add_argument("--journal-mode", default=_STORAGE_PROFILE_KEYS["journal_mode"],
+                   type=str.upper, choices=_JOURNAL_MODES,
+                   help="Режим журнала SQLite (PRAGMA journal_mode)")
+    g.add_argument("--busy-timeout", type=_non_negative_int, default=_STORAGE_PROFILE_KEYS["busy_timeout"],
+                   help="Ожидание снятия блокировки SQLite в миллисекундах")
+    g.add_argument("--synchronous", default=_STORAGE_PROFILE_KEYS["synchronous"],
+                   type=str.upper, choices=_SYNCHRONOUS_MODES,
+                   help="Режим синхронизации SQLite (PRAGMA synchronous)")
+    g.add_argument("--maintenance-interval", type=_non_negative_int, default=_STORAGE_PROFILE_KEYS["maintenance_interval"],
+                   help="Период VACUUM/ANALYZE в секундах (0 — отключено)")
+    g.add_argument("--storage-profiles", default=None,
+                   help="JSON-файл с профилями по курсам: {\"default\": {...}, \"<курс>\": {...}}")
     args = p.parse_args()
 
     csv_path = Path(args.csv).resolve()
@@ -34,12 +60,26 @@ def main():
     # Разбор CSV-файла
     users, courses = _parse_csv(csv_path)
 
+    # Профили хранения журнала оценок для каждого курса
+    defaults = dict(
+        _STORAGE_PROFILE_KEYS,
+        gradebook_dir=args.gradebook_dir,
+        journal_mode=args.journal_mode,
+        busy_timeout=args.busy_timeout,
+        synchronous=args.synchronous,
+        maintenance_interval=args.maintenance_interval,
+    )
+    profiles_path = Path(args.storage_profiles).resolve() if args.storage_profiles else None
+    profiles = _load_storage_profiles(courses, defaults, profiles_path)
+
     # Генерация всех необходимых файлов
     _gen_jupyterhub_config(users, courses, out_dir / "jupyterhub_config.py")
-    _gen_nbgrader_configs(courses, out_dir)
+    _gen_nbgrader_configs(courses, profiles, out_dir)
     _gen_jupyter_server_config(out_dir / "jupyter_server_config.py")
     _gen_global_nbgrader_config(out_dir / "global_nbgrader_config.py")
-    _gen_setup_script(users, courses, out_dir / "setup.sh")
+    _gen_gradebook_maintenance_script(out_dir / "gradebook_maintenance.py")
+    _gen_gradebook_pragmas_module(out_dir / "gradebook_pragmas.py")
+    _gen_setup_script(users, courses, profiles, out_dir / "setup.sh")
     _gen_dockerfile(courses, out_dir / "Dockerfile")
 
 
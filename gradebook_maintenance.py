@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""gradebook_maintenance.py - Периодическое обслуживание журнала оценок nbgrader (SQLite).
+
+Раз в `--interval` секунд переносит WAL в основной файл, выполняет `VACUUM` и `ANALYZE`.
+Скрипт использует только стандартную библиотеку и запускается из `setup.sh` от имени grader-пользователя курса.
+
+Пример запуска:
+    python3 gradebook_maintenance.py /home/grader-course101/course101/gradebook.db --interval 86400
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+
+def _maintain(db_path: Path, busy_timeout: int):
+    """Выполняет один цикл обслуживания базы данных."""
+    con = sqlite3.connect(db_path, timeout=busy_timeout / 1000, isolation_level=None)
+    try:
+        con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        con.execute("VACUUM")
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+
+
+def main():
+    """Главная функция: разбор аргументов и цикл обслуживания."""
+
+    p = argparse.ArgumentParser(description="Периодический VACUUM/ANALYZE журнала оценок nbgrader")
+    p.add_argument("db_path", help="Путь к файлу gradebook.db")
+    p.add_argument("--interval", type=int, default=86400, help="Период обслуживания в секундах")
+    p.add_argument("--busy-timeout", type=int, default=30000, help="Ожидание снятия блокировки в миллисекундах")
+    p.add_argument("--once", action="store_true", help="Выполнить обслуживание один раз и выйти")
+    args = p.parse_args()
+
+    db_path = Path(args.db_path)
+    while True:
+        if not args.once:
+            time.sleep(args.interval)
+
+        # База создаётся nbgrader при первом обращении, до этого обслуживать нечего
+        if db_path.exists():
+            try:
+                _maintain(db_path, args.busy_timeout)
+                print(f"✅ Обслуживание {db_path} выполнено", flush=True)
+            except sqlite3.OperationalError as e:
+                print(f"⚠️  Обслуживание {db_path} пропущено: {e}", flush=True)
+
+        if args.once:
+            break
+
+
+# Точка входа
+if __name__ == "__main__":
+    main()
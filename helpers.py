@@ -1,14 +1,29 @@
 """Вспомогательные функции для генерации конфигураций."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+import argparse
 import csv
 import json
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from collections import defaultdict
 
 from nbgrader.api import SubmittedNotebook
 from nbgrader.apps import GenerateAssignmentApp, ReleaseAssignmentApp
 
+# Параметры профиля хранения журнала оценок и их значения по умолчанию
+_STORAGE_PROFILE_KEYS = {
+    "db_url": "",
+    "gradebook_dir": "",
+    "journal_mode": "WAL",
+    "busy_timeout": 30000,
+    "synchronous": "NORMAL",
+    "maintenance_interval": 0,
+}
+
+# Допустимые значения PRAGMA journal_mode и PRAGMA synchronous (неизвестные SQLite молча игнорирует)
+_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
 
 def _parse_csv(csv_path: Path):
     """Разбирает CSV-файл и возвращает пользователей и курсы."""
@@ -47,6 +62,93 @@ def _parse_csv(csv_path: Path):
     return users, courses
 
 
+def _load_storage_profiles(courses: Dict, defaults: Dict, profiles_path: Optional[Path] = None) -> Dict[str, Dict]:
+    """Собирает профиль хранения журнала оценок (gradebook) для каждого курса.
+
+    Значения берутся из `defaults` (аргументы CLI), затем из секции `"default"` JSON-файла
+    `profiles_path` и, наконец, из секции с именем курса.
+    """
+    overrides: Dict[str, Dict] = {}
+    if profiles_path is not None:
+        overrides = json.loads(profiles_path.read_text(encoding="utf-8"))
+
+    for section, values in overrides.items():
+        if section != "default" and section not in courses:
+            raise ValueError(f"Профиль '{section}' не соответствует ни одному курсу: {sorted(courses)}")
+        unknown = set(values) - set(_STORAGE_PROFILE_KEYS)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры профиля '{section}': {sorted(unknown)}")
+    # Общий db_url направил бы все курсы (и их циклы обслуживания) в один файл
+    if "db_url" in overrides.get("default", {}):
+        raise ValueError("Параметр 'db_url' нельзя задавать в профиле 'default', только для отдельного курса")
+
+    profiles: Dict[str, Dict] = {}
+    for cid in courses:
+        profile = {**defaults, **overrides.get("default", {}), **overrides.get(cid, {})}
+        profile["journal_mode"] = str(profile["journal_mode"]).upper()
+        profile["synchronous"] = str(profile["synchronous"]).upper()
+        if profile["journal_mode"] not in _JOURNAL_MODES:
+            raise ValueError(f"Курс '{cid}': недопустимый journal_mode '{profile['journal_mode']}', "
+                             f"ожидается один из {list(_JOURNAL_MODES)}")
+        if profile["synchronous"] not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"Курс '{cid}': недопустимый synchronous '{profile['synchronous']}', "
+                             f"ожидается один из {list(_SYNCHRONOUS_MODES)}")
+
+        for key in ("busy_timeout", "maintenance_interval"):
+            value = profile[key]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(f"Курс '{cid}': {key} должен быть неотрицательным целым числом, получено {value!r}")
+
+        if not profile.get("db_url"):
+            if profile.get("gradebook_dir"):
+                # Относительный путь setup.sh, nbgrader и PRAGMA-хук разрешали бы от разных каталогов
+                if not PurePosixPath(profile["gradebook_dir"]).is_absolute():
+                    raise ValueError(f"Курс '{cid}': gradebook_dir должен быть абсолютным путём, "
+                                     f"получено '{profile['gradebook_dir']}'")
+                db_file = f"{profile['gradebook_dir'].rstrip('/')}/{cid}/gradebook.db"
+            else:
+                db_file = f"/home/grader-{cid}/{cid}/gradebook.db"
+            profile["db_url"] = f"sqlite:///{db_file}"
+
+        # Путь к файлу БД известен только для SQLite; для других СУБД PRAGMA и обслуживание не нужны
+        if profile["db_url"].startswith("sqlite:///"):
+            profile["db_path"] = profile["db_url"][len("sqlite:///"):].split("?", 1)[0]
+            if not PurePosixPath(profile["db_path"]).is_absolute():
+                raise ValueError(f"Курс '{cid}': db_url должен указывать абсолютный путь к SQLite, "
+                                 f"получено '{profile['db_url']}'")
+        else:
+            profile["db_path"] = ""
+        profiles[cid] = profile
+
+    return profiles
+
+
+def _non_negative_int(value: str) -> int:
+    """Тип argparse для неотрицательных целых параметров (таймауты, интервалы)."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается целое число, получено '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"ожидается неотрицательное число, получено {number}")
+    return number
+
+
+def _sqlite_pragmas(profile: Dict) -> List[str]:
+    """Формирует список PRAGMA, выполняемых при каждом подключении к журналу оценок SQLite.
+
+    `busy_timeout` идёт первым: переключение в WAL требует эксклюзивной блокировки и должно ждать её
+    с настроенным таймаутом, а не со значением pysqlite по умолчанию.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout={int(profile['busy_timeout'])}",
+        f"PRAGMA journal_mode={profile['journal_mode']}",
+    ]
+    if profile.get("synchronous"):
+        pragmas.append(f"PRAGMA synchronous={profile['synchronous']}")
+    return pragmas
+
+
 def _bash_array(name: str, elements: List[str]) -> str:
     """Формирует bash-массив из элементов."""
     quoted = " ".join(json.dumps(e) for e in elements)